@@ -1,82 +1,245 @@
 #!/usr/bin/env python3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from datetime import datetime
-from collections import defaultdict
+from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from heapq import nlargest
+from operator import attrgetter, itemgetter
+from urllib.parse import parse_qs, urlparse
 import os
+import threading
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAX_WORKERS = 10
+HTTP_CACHE = 'data/.http_cache'
+_DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+USER_REPOS_QUERY = '''
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    login
+    name
+    bio
+    createdAt
+    followers { totalCount }
+    following { totalCount }
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, privacy: PUBLIC) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+      }
+    }
+  }
+}
+'''
+
+@lru_cache(maxsize=4096)
+def _weekday(day):
+    # Events cluster on a few days, so each 'YYYY-MM-DD' is only parsed once
+    return datetime.fromisoformat(day).weekday()
+
+def _json_loads(content):
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _json_dumps(data):
+    if orjson is not None:
+        # commit_hours is keyed by int, which orjson rejects by default
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    # The dashboard doesn't need pretty-printing; pipe through json.tool to read it
+    return json.dumps(data, separators=(',', ':')).encode()
+
+class _Event:
+    # Only the fields the analyzers read, so the raw API dicts can be dropped
+    __slots__ = ('type', 'created_at')
+    
+    def __init__(self, etype, created_at):
+        self.type = etype
+        self.created_at = created_at
 
 class GitHubAnalytics:
     def __init__(self, username, token=None):
         self.username = username
+        self.token = token
         self.headers = {}
         if token:
             self.headers['Authorization'] = f'token {token}'
         self.base_url = 'https://api.github.com'
+        self.session = self._make_session()
+        self.session.headers.update(self.headers)
+        # Events and repo pages are fetched side by side, so keep enough
+        # keep-alive connections to api.github.com for both pools
+        # raise_on_status=False hands the last 5xx back to the status_code checks
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2 * MAX_WORKERS, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.rate_limit_remaining = None
+        self._rate_limit_lock = threading.Lock()
+    
+    def _make_session(self):
+        if requests_cache is None:
+            return requests.Session()
+        # Revalidates with If-None-Match; GitHub's 304s don't count against the rate limit
+        os.makedirs(os.path.dirname(HTTP_CACHE), exist_ok=True)
+        return requests_cache.CachedSession(
+            HTTP_CACHE,
+            backend='sqlite',
+            cache_control=True,
+            expire_after=timedelta(minutes=10),
+            allowable_codes=(200,)
+        )
+    
+    def _get(self, url):
+        # Once the budget is spent GitHub rejects everything, so skip the round trip
+        if self.rate_limit_remaining == 0:
+            return None
+        response = self.session.get(url)
+        if getattr(response, 'from_cache', False) or 'X-RateLimit-Remaining' not in response.headers:
+            return response
+        remaining = int(response.headers['X-RateLimit-Remaining'])
+        # Page workers share the counter; check-and-set under the lock so only one warns
+        with self._rate_limit_lock:
+            exhausted = remaining == 0 and self.rate_limit_remaining != 0
+            self.rate_limit_remaining = remaining
+        if exhausted:
+            reset = datetime.fromtimestamp(int(response.headers['X-RateLimit-Reset']))
+            print(f"GitHub API rate limit reached, try again after {reset:%H:%M:%S}")
+        return response
     
     def fetch_user_info(self):
         url = f'{self.base_url}/users/{self.username}'
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url)
+        if response is None:
+            return None
         if response.status_code == 200:
-            return response.json()
+            return _json_loads(response.content)
         else:
             print(f"Error fetching user info: {response.status_code}")
             return None
     
-    def fetch_repos(self):
+    def fetch_graphql(self, query, variables):
+        url = f'{self.base_url}/graphql'
+        response = self.session.post(url, json={'query': query, 'variables': variables})
+        if response.status_code != 200:
+            print(f"Error running GraphQL query: {response.status_code}")
+            return None
+        data = _json_loads(response.content)
+        if data.get('errors'):
+            print(f"Error running GraphQL query: {data['errors'][0]['message']}")
+            return None
+        return data['data']
+    
+    def fetch_user_and_repos(self):
+        # GraphQL requires a token; returns the same shapes as fetch_user_info/fetch_repos
+        user_info = None
         repos = []
-        page = 1
+        cursor = None
         while True:
-            url = f'{self.base_url}/users/{self.username}/repos?page={page}&per_page=100'
-            response = requests.get(url, headers=self.headers)
-            if response.status_code != 200:
-                break
-            data = response.json()
-            if not data:
+            data = self.fetch_graphql(USER_REPOS_QUERY, {'login': self.username, 'cursor': cursor})
+            if not data or not data['user']:
+                return None, []
+            user = data['user']
+            connection = user['repositories']
+            if user_info is None:
+                user_info = {
+                    'login': user['login'],
+                    'name': user['name'],
+                    'bio': user['bio'],
+                    'public_repos': connection['totalCount'],
+                    'followers': user['followers']['totalCount'],
+                    'following': user['following']['totalCount'],
+                    'created_at': user['createdAt']
+                }
+            for node in connection['nodes']:
+                language = node['primaryLanguage']
+                repos.append({
+                    'name': node['name'],
+                    'stargazers_count': node['stargazerCount'],
+                    'forks_count': node['forkCount'],
+                    'language': language['name'] if language else None
+                })
+            if not connection['pageInfo']['hasNextPage']:
+                return user_info, repos
+            cursor = connection['pageInfo']['endCursor']
+    
+    def _fetch_pages(self, url, max_pages=None):
+        # Page 1's Link header names the last page; fetch the rest in parallel
+        response = self._get(f'{url}&page=1')
+        if response is None or response.status_code != 200:
+            return []
+        items = _json_loads(response.content)
+        last_url = response.links.get('last', {}).get('url')
+        if not last_url:
+            return items
+        last_page = int(parse_qs(urlparse(last_url).query)['page'][0])
+        if max_pages:
+            last_page = min(last_page, max_pages)
+        urls = [f'{url}&page={page}' for page in range(2, last_page + 1)]
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            pages = list(pool.map(self._get_page, urls))
+        for page in pages:
+            if page is None:
                 break
-            repos.extend(data)
-            page += 1
-        return repos
+            items.extend(page)
+        return items
+    
+    def _get_page(self, url):
+        # Decode in the worker so parsing overlaps with the pages still in flight
+        response = self._get(url)
+        if response is None or response.status_code != 200:
+            return None
+        return _json_loads(response.content)
+    
+    def fetch_repos(self):
+        return self._fetch_pages(f'{self.base_url}/users/{self.username}/repos?per_page=100')
     
     def fetch_events(self, pages=3):
-        events = []
-        for page in range(1, pages + 1):
-            url = f'{self.base_url}/users/{self.username}/events?page={page}&per_page=100'
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                events.extend(response.json())
-            else:
-                break
-        return events
+        events = self._fetch_pages(f'{self.base_url}/users/{self.username}/events?per_page=100', max_pages=pages)
+        return [_Event(event['type'], event['created_at']) for event in events]
     
     def analyze_languages(self, repos):
-        language_stats = defaultdict(int)
-        for repo in repos:
-            if repo['language']:
-                language_stats[repo['language']] += 1
-        return dict(language_stats)
-    
-    def analyze_commit_times(self, events):
-        commit_hours = defaultdict(int)
-        commit_days = defaultdict(int)
-        for event in events:
-            if event['type'] == 'PushEvent':
-                created_at = datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-                hour = created_at.hour
-                day = created_at.strftime('%A')
-                commit_hours[hour] += 1
-                commit_days[day] += 1
-        return dict(commit_hours), dict(commit_days)
+        return dict(Counter(repo['language'] for repo in repos if repo['language']))
     
-    def analyze_activity_types(self, events):
-        activity_types = defaultdict(int)
-        for event in events:
-            activity_types[event['type']] += 1
-        return dict(activity_types)
+    def _analyze_events(self, events):
+        # Counter does the increments in C; PushEvent timestamps are collected once
+        activity_types = Counter(map(attrgetter('type'), events))
+        # created_at is always 'YYYY-MM-DDTHH:MM:SSZ'
+        push_times = [event.created_at for event in events if event.type == 'PushEvent']
+        # Fixed-size bins indexed by hour/weekday instead of hashing keys
+        hour_bins = [0] * 24
+        day_bins = [0] * 7
+        for created_at in push_times:
+            hour_bins[int(created_at[11:13])] += 1
+            day_bins[_weekday(created_at[:10])] += 1
+        commit_hours = {hour: count for hour, count in enumerate(hour_bins) if count}
+        commit_days = {_DAYS[day]: count for day, count in enumerate(day_bins) if count}
+        return commit_hours, commit_days, dict(activity_types)
     
     def get_repo_stats(self, repos):
-        total_stars = sum(repo['stargazers_count'] for repo in repos)
-        total_forks = sum(repo['forks_count'] for repo in repos)
-        top_repos = sorted(repos, key=lambda x: x['stargazers_count'], reverse=True)[:5]
+        total_stars = 0
+        total_forks = 0
+        for repo in repos:
+            total_stars += repo['stargazers_count']
+            total_forks += repo['forks_count']
+        top_repos = nlargest(5, repos, key=itemgetter('stargazers_count'))
         top_repos_data = [
             {
                 'name': repo['name'],
@@ -95,17 +258,26 @@ class GitHubAnalytics:
     
     def generate_analytics(self):
         print(f"Fetching data for {self.username}...")
-        user_info = self.fetch_user_info()
+        print("Fetching user info, repositories and recent events...")
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            events_future = pool.submit(self.fetch_events, pages=3)
+            user_info = None
+            if self.token:
+                # One GraphQL round trip covers the user and all repos; events are REST-only
+                user_info, repos = self.fetch_user_and_repos()
+            if not user_info:
+                user_future = pool.submit(self.fetch_user_info)
+                repos_future = pool.submit(self.fetch_repos)
+                user_info = user_future.result()
+                repos = repos_future.result()
+            events = events_future.result()
         if not user_info:
             return None
-        print("Fetching repositories...")
-        repos = self.fetch_repos()
-        print("Fetching recent events...")
-        events = self.fetch_events(pages=3)
+        if self.rate_limit_remaining == 0:
+            print("Warning: rate limit hit while fetching, analytics will be partial")
         print("Analyzing data...")
         languages = self.analyze_languages(repos)
-        commit_hours, commit_days = self.analyze_commit_times(events)
-        activity_types = self.analyze_activity_types(events)
+        commit_hours, commit_days, activity_types = self._analyze_events(events)
         repo_stats = self.get_repo_stats(repos)
         analytics = {
             'user': {
@@ -128,8 +300,8 @@ class GitHubAnalytics:
     
     def save_to_file(self, data, filename='data/analytics.json'):
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(_json_dumps(data))
         print(f"Data saved to {filename}")
 
 def main():